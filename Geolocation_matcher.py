@@ -1,9 +1,39 @@
+import argparse
 import math
-import csv
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+import tempfile
+import numpy as np
 import pandas as pd
 import logging
+import scipy
+import sklearn
 from scipy.spatial import KDTree
+from sklearn.neighbors import BallTree
 import re
+import sys
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
+try:
+    from _haversine import closest_points as _closest_points_cython
+except ImportError:
+    _closest_points_cython = None
 
 # Set up logging for skipped rows
 logging.basicConfig(
@@ -13,6 +43,25 @@ logging.basicConfig(
 )
 radius_earth = 6371
 
+# Built spatial trees keyed by tree type and a hash of the indexed points. The most recently used trees are
+# kept in memory; saving them to disk is opt-in via GEOMATCH_TREE_CACHE, which should point at a directory
+# only you can write, since loading a cached tree unpickles it
+_tree_cache = OrderedDict()
+TREE_CACHE_MAX_TREES = 16
+TREE_CACHE_DIR = os.environ.get('GEOMATCH_TREE_CACHE')
+TREE_CACHE_MAX_FILES = 16
+
+# Bound math functions used by the scalar haversine, saving a module attribute lookup per call
+_sin = math.sin
+_cos = math.cos
+_asin = math.asin
+_sqrt = math.sqrt
+_radians = math.radians
+
+# Coordinate formats accepted by parse_coordinate, compiled once at import
+_DMS_RE = re.compile(r"(\d+)°\s*(\d+)'?\s*(\d+(?:\.\d+)?)?\"?\s*([NSEW])?", re.IGNORECASE)
+_DD_RE = re.compile(r"([+-]?\d+(?:\.\d+)?)°?\s*([NSEW])?", re.IGNORECASE)
+
 """
     Calculate the great-circle distance between two points on the Earth's surface using the Haversine formula.
     Inputs:
@@ -23,72 +72,436 @@ radius_earth = 6371
 """
 def haversine(lat1, lon1, lat2, lon2):
     
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    # Coincident points are common in real data and need no trig at all
+    if lat1 == lat2 and lon1 == lon2:
+        return 0.0
+
+    lat1 = _radians(lat1)
+    lat2 = _radians(lat2)
+
+    sin_dlat = _sin((lat1 - lat2) * 0.5)
+    sin_dlon = _sin(_radians(lon1 - lon2) * 0.5)
+
+    a = sin_dlat * sin_dlat + _cos(lat1) * _cos(lat2) * sin_dlon * sin_dlon
+    return 2 * radius_earth * _asin(_sqrt(min(a, 1.0)))
+
+"""
+    Calculate great-circle distances element-wise between two broadcastable sets of points in radians.
+    Inputs:
+        lat1, lon1, cos_lat1: Latitude, longitude and cos(latitude) of the first points.
+        lat2, lon2, cos_lat2: Latitude, longitude and cos(latitude) of the second points.
+        xp: Array module the inputs belong to (numpy or cupy).
+    Outputs:
+        An array of distances in kilometers with the broadcast shape of the inputs.
+"""
+def _haversine_radians(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2, xp=np):
+    a = xp.sin((lat1 - lat2) / 2)**2 + cos_lat1 * cos_lat2 * xp.sin((lon1 - lon2) / 2)**2
+    # Clamp rounding error near antipodal points before the arcsin
+    return radius_earth * 2 * xp.arcsin(xp.sqrt(xp.minimum(a, 1)))
+
+"""
+    Calculate the pairwise great-circle distances between two sets of points using NumPy broadcasting.
+    When numexpr is installed, float64 inputs on a multi-core machine are evaluated in a single fused,
+    multi-threaded pass; float32 stays on NumPy, whose SIMD float32 trig is several times faster per core.
+    CuPy arrays are accepted as well and are computed on the GPU.
+    Inputs:
+        lats1, lons1: Arrays of latitudes and longitudes of the first set of points in degrees.
+        lats2, lons2: Arrays of latitudes and longitudes of the second set of points in degrees.
+        dtype: Floating point type the distances are computed in.
+    Outputs:
+        A (len(lats1), len(lats2)) array of distances in kilometers.
+"""
+def haversine_vector(lats1, lons1, lats2, lons2, dtype=np.float64):
+    xp = cp.get_array_module(lats1) if cp is not None else np
+    lats1, lons1, lats2, lons2 = (xp.radians(x).astype(dtype, copy=False) for x in [lats1, lons1, lats2, lons2])
+
+    if ne is not None and xp is np and np.dtype(dtype) == np.float64 and ne.detect_number_of_cores() > 1:
+        # Fuse the whole formula into one expression so the N x M result is the only N x M allocation
+        local_dict = {
+            'lat1': lats1[:, None], 'lon1': lons1[:, None], 'cos_lat1': np.cos(lats1)[:, None],
+            'lat2': lats2[None, :], 'lon2': lons2[None, :], 'cos_lat2': np.cos(lats2)[None, :],
+            'radius_earth': dtype(radius_earth),
+        }
+        # numexpr merges the repeated term, so the clamp does not evaluate it twice; testing a > 1 rather
+        # than a < 1 lets NaN fail the test and pass through, matching np.minimum on the NumPy path
+        a = "(sin((lat1 - lat2) / 2)**2 + cos_lat1 * cos_lat2 * sin((lon1 - lon2) / 2)**2)"
+        return ne.evaluate(f"2 * radius_earth * arcsin(sqrt(where({a} > 1, 1, {a})))", local_dict=local_dict)
+
+    return _haversine_radians(
+        lats1[:, None], lons1[:, None], xp.cos(lats1)[:, None],
+        lats2[None, :], lons2[None, :], xp.cos(lats2)[None, :],
+        xp,
+    )
+
+"""
+    Find the closest point in array 2 for each point in array 1 by computing every pairwise distance.
+    Rows of array 1 are processed in blocks so only a block_size x len(array 2) matrix is held at once,
+    and the search runs in float32 to halve the memory traffic of each block. The reported distance
+    is recomputed in float64 for the winning point only, so sub-metre separations do not round to zero.
+    Inputs:
+        points1, points2: (N, 2) arrays of (latitude, longitude) in degrees.
+        block_size: Number of rows of points1 per distance block.
+    Outputs:
+        The index of the closest point in points2 and its distance in kilometers for each row of points1.
+"""
+def _match_brute(points1, points2, block_size=256):
+    closest_idx = np.empty(len(points1), dtype=np.int64)
 
-    delta_lat = lat1 - lat2
-    delta_lon = lon1 - lon2
+    for start in range(0, len(points1), block_size):
+        block = points1[start:start + block_size]
+        distances = haversine_vector(block[:, 0], block[:, 1], points2[:, 0], points2[:, 1], dtype=np.float32)
+        closest_idx[start:start + block_size] = distances.argmin(axis=1)
 
-    a = math.sin(delta_lat / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(delta_lon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return radius_earth * c
+    return closest_idx, _closest_distance_float64(points1, points2, closest_idx)
 
 """
-    Find the closest point in the second array for each point in the first array using a KDTree.
+    Distance in kilometers, in float64, from each point in array 1 to its chosen point in array 2.
+"""
+def _closest_distance_float64(points1, points2, closest_idx):
+    rad1 = np.radians(points1)
+    rad2 = np.radians(points2[closest_idx])
+    return _haversine_radians(rad1[:, 0], rad1[:, 1], np.cos(rad1[:, 0]), rad2[:, 0], rad2[:, 1], np.cos(rad2[:, 0]))
+
+"""
+    Return a spatial tree for data, reusing one built earlier in this process or, when TREE_CACHE_DIR is set,
+    one saved there by an earlier run with the same scikit-learn and scipy versions.
     Inputs:
-        array1: List of tuples containing (latitude, longitude) of points.
-        array2: List of tuples containing (latitude, longitude) of points.
+        kind: Name of the tree type, part of the cache key.
+        data: Array the tree is built on.
+        build: Callable that builds the tree from data on a cache miss.
+    Outputs:
+        The built tree.
+"""
+def _cached_tree(kind, data, build):
+    data = np.ascontiguousarray(data)
+    digest = hashlib.blake2b(data.tobytes()).hexdigest()[:16]
+    key = f"{kind}-sklearn{sklearn.__version__}-scipy{scipy.__version__}-{digest}"
+    if key in _tree_cache:
+        _tree_cache.move_to_end(key)
+        return _tree_cache[key]
+
+    tree = _load_cached_tree(key) if TREE_CACHE_DIR else None
+    if tree is None:
+        tree = build(data)
+        if TREE_CACHE_DIR:
+            _save_cached_tree(key, tree)
+
+    # Evict the least recently used trees so a long-lived process does not hold every array 2 it has seen
+    _tree_cache[key] = tree
+    while len(_tree_cache) > TREE_CACHE_MAX_TREES:
+        _tree_cache.popitem(last=False)
+    return tree
+
+"""
+    Load a tree from TREE_CACHE_DIR, returning None if it is missing, unreadable or not a tree.
+"""
+def _load_cached_tree(key):
+    path = os.path.join(TREE_CACHE_DIR, f"{key}.pkl")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            tree = pickle.load(file)
+    except Exception as e:
+        print(f"Ignoring unreadable cached tree {path}: {e}")
+        return None
+    if not isinstance(tree, (BallTree, KDTree)):
+        print(f"Ignoring cached file {path}: it does not contain a spatial tree.")
+        return None
+
+    # Refresh the modification time so pruning, which drops the oldest files, keeps recently used trees
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return tree
+
+"""
+    Save a tree to TREE_CACHE_DIR atomically, then drop the least recently used files beyond TREE_CACHE_MAX_FILES.
+"""
+def _save_cached_tree(key, tree):
+    path = os.path.join(TREE_CACHE_DIR, f"{key}.pkl")
+    tmp_path = None
+    try:
+        os.makedirs(TREE_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so other processes never see a half-written pickle
+        with tempfile.NamedTemporaryFile(dir=TREE_CACHE_DIR, suffix='.tmp', delete=False) as file:
+            tmp_path = file.name
+            pickle.dump(tree, file)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    except OSError as e:
+        print(f"Could not cache tree to {path}: {e}")
+        return
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    try:
+        cached = sorted(
+            (os.path.join(TREE_CACHE_DIR, name) for name in os.listdir(TREE_CACHE_DIR) if name.endswith('.pkl')),
+            key=os.path.getmtime,
+        )
+        for old_path in cached[:-TREE_CACHE_MAX_FILES]:
+            os.remove(old_path)
+    except OSError:
+        # Another process may be pruning the same directory; the next save will try again
+        pass
+
+"""
+    Find the closest point in array 2 for each point in array 1 using a BallTree with the haversine metric.
+    Inputs:
+        points1, points2: (N, 2) arrays of (latitude, longitude) in degrees.
+    Outputs:
+        The index of the closest point in points2 and its distance in kilometers for each row of points1.
+"""
+def _match_balltree(points1, points2):
+    tree = _cached_tree('balltree', np.radians(points2), lambda data: BallTree(data, metric='haversine'))
+    dist, idx = tree.query(np.radians(points1), k=1)
+
+    # The tree returns great-circle distances on the unit sphere
+    return idx[:, 0], dist[:, 0] * radius_earth
+
+"""
+    Convert (latitude, longitude) in degrees to 3D unit vectors so Euclidean distance is the chord length.
+"""
+def _to_unit_vectors(points):
+    lat, lon = np.radians(points[:, 0]), np.radians(points[:, 1])
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+"""
+    Find the closest point in array 2 for each point in array 1 using a KDTree on 3D unit vectors.
+    All points are queried in one batched call spread across every CPU core.
+    Inputs:
+        points1, points2: (N, 2) arrays of (latitude, longitude) in degrees.
+    Outputs:
+        The index of the closest point in points2 and its distance in kilometers for each row of points1.
+"""
+def _match_kdtree(points1, points2):
+    tree = _cached_tree('kdtree', _to_unit_vectors(points2), KDTree)
+    chord, idx = tree.query(_to_unit_vectors(points1), k=1, workers=-1)
+
+    # Chord length on the unit sphere maps to the central angle analytically, no haversine needed
+    return idx, 2 * radius_earth * np.arcsin(np.minimum(1.0, chord / 2))
+
+"""
+    Find the closest point in array 2 for each point in array 1 using an equirectangular projection pre-filter.
+    A KDTree on the flat-earth projection proposes a few candidates and only those get an exact haversine.
+    Suited to geographically clustered data; the projection does not wrap across the antimeridian.
+    Inputs:
+        points1, points2: (N, 2) arrays of (latitude, longitude) in degrees.
+        candidates: Number of projected neighbours to re-rank with the exact distance.
+    Outputs:
+        The index of the closest point in points2 and its distance in kilometers for each row of points1.
+"""
+def _match_equirect(points1, points2, candidates=3):
+    rad1 = np.radians(points1)
+    rad2 = np.radians(points2)
+    scale = np.cos(np.concatenate([rad1[:, 0], rad2[:, 0]]).mean())
+
+    tree = KDTree(np.column_stack([rad2[:, 1] * scale, rad2[:, 0]]))
+    # Passing k as a list keeps idx two-dimensional even when only one candidate is requested
+    k = min(candidates, len(points2))
+    _, idx = tree.query(np.column_stack([rad1[:, 1] * scale, rad1[:, 0]]), k=list(range(1, k + 1)), workers=-1)
+
+    # Re-rank the candidates with the exact great-circle distance
+    distances = _haversine_radians(
+        rad1[:, 0, None], rad1[:, 1, None], np.cos(rad1[:, 0, None]),
+        rad2[idx, 0], rad2[idx, 1], np.cos(rad2[idx, 0]),
+    )
+
+    best = distances.argmin(axis=1)
+    rows = np.arange(len(points1))
+    return idx[rows, best], distances[rows, best]
+
+_MATCHERS = {
+    'balltree': _match_balltree,
+    'brute': _match_brute,
+    'equirect': _match_equirect,
+    'kdtree': _match_kdtree,
+}
+
+if njit is not None:
+    """
+        Parallel pairwise haversine kernel that keeps only the closest point per row.
+        Inputs:
+            lat1, lon1, cos_lat1: Latitude, longitude (radians) and cos(latitude) of the query points.
+            lat2, lon2, cos_lat2: Latitude, longitude (radians) and cos(latitude) of the candidate points.
+            out_idx, out_dist: Output arrays filled with the closest index and distance in kilometers.
+    """
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _closest_haversine_numba(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2, out_idx, out_dist):
+        for i in prange(lat1.shape[0]):
+            best_j = 0
+            best_a = 2.0
+            for j in range(lat2.shape[0]):
+                if lat1[i] == lat2[j] and lon1[i] == lon2[j]:
+                    a = 0.0
+                else:
+                    sin_dlat = math.sin((lat1[i] - lat2[j]) * 0.5)
+                    sin_dlon = math.sin((lon1[i] - lon2[j]) * 0.5)
+                    a = sin_dlat * sin_dlat + cos_lat1[i] * cos_lat2[j] * sin_dlon * sin_dlon
+                # The distance grows monotonically with a, so only the best candidate in each row needs the asin
+                if a < best_a:
+                    best_a = a
+                    best_j = j
+                # Nothing can beat a zero distance, so stop scanning the row
+                if best_a == 0.0:
+                    break
+            out_idx[i] = best_j
+            out_dist[i] = 2 * radius_earth * math.asin(math.sqrt(min(best_a, 1.0)))
+
+    """
+        Find the closest point in array 2 for each point in array 1 with the compiled Numba kernel.
+        Inputs:
+            points1, points2: (N, 2) arrays of (latitude, longitude) in degrees.
+        Outputs:
+            The index of the closest point in points2 and its distance in kilometers for each row of points1.
+    """
+    def _match_numba(points1, points2):
+        rad1 = np.radians(points1)
+        rad2 = np.radians(points2)
+        lat1, lon1 = np.ascontiguousarray(rad1[:, 0]), np.ascontiguousarray(rad1[:, 1])
+        lat2, lon2 = np.ascontiguousarray(rad2[:, 0]), np.ascontiguousarray(rad2[:, 1])
+
+        closest_idx = np.empty(len(points1), dtype=np.int64)
+        closest_dist = np.empty(len(points1), dtype=np.float64)
+        # Precompute the per-point cosines once instead of inside the pairwise loop
+        _closest_haversine_numba(lat1, lon1, np.cos(lat1), lat2, lon2, np.cos(lat2), closest_idx, closest_dist)
+        return closest_idx, closest_dist
+
+    _MATCHERS['numba'] = _match_numba
+
+if _closest_points_cython is not None:
+    # The compiled kernel already takes (N, 2) degree arrays and returns (indices, distances in km);
+    # it releases the GIL, so calls from several threads run concurrently
+    _MATCHERS['cython'] = _closest_points_cython
+
+if cp is not None:
+    """
+        Find the closest point in array 2 for each point in array 1 on the GPU with CuPy.
+        Array 2 is copied to the device once; array 1 is streamed in blocks and reduced on-device,
+        so only the closest indices are copied back; their distances are then recomputed in float64.
+        Inputs:
+            points1, points2: (N, 2) arrays of (latitude, longitude) in degrees.
+            block_size: Number of rows of points1 per distance block.
+        Outputs:
+            The index of the closest point in points2 and its distance in kilometers for each row of points1.
+    """
+    def _match_cuda(points1, points2, block_size=4096):
+        lats2 = cp.asarray(points2[:, 0])
+        lons2 = cp.asarray(points2[:, 1])
+        closest_idx = cp.empty(len(points1), dtype=cp.int64)
+
+        for start in range(0, len(points1), block_size):
+            block = cp.asarray(points1[start:start + block_size])
+            distances = haversine_vector(block[:, 0], block[:, 1], lats2, lons2, dtype=np.float32)
+            closest_idx[start:start + block_size] = distances.argmin(axis=1)
+
+        # Search in float32 on the device, but report the winning distances in float64 like _match_brute
+        closest_idx = cp.asnumpy(closest_idx)
+        return closest_idx, _closest_distance_float64(points1, points2, closest_idx)
+
+    _MATCHERS['cuda'] = _match_cuda
+
+"""
+    Find the closest point in the second array for each point in the first array.
+    Inputs:
+        array1: (N, 2) array of (latitude, longitude) of points.
+        array2: (N, 2) array of (latitude, longitude) of points.
+        method: 'balltree' (default), 'brute' for the full pairwise distance matrix,
+                'kdtree' for a KDTree on 3D unit vectors, 'equirect' for a flat-earth
+                pre-filter on clustered data, 'numba' for the compiled pairwise kernel
+                (requires numba), 'cython' for the compiled _haversine extension, or 'cuda'
+                for the GPU pairwise kernel (requires cupy).
     Outputs:
         A list of tuples where each entry contains the closest points from array 2 and the distance
 """
-def match_closest_points(array1, array2):
-    if not array1 or not array2:
+def match_closest_points(array1, array2, method='balltree'):
+    if len(array1) == 0 or len(array2) == 0:
         print("One or both input arrays are empty. Exiting.")
         return []
+    if method not in _MATCHERS:
+        raise ValueError(f"Unknown method '{method}'. Choose from: {', '.join(_MATCHERS)}")
 
-    # Build the KDTree for array2
-    tree = KDTree([(math.radians(lat), math.radians(lon)) for lat, lon in array2])
+    points1 = np.asarray(array1, dtype=np.float64).reshape(-1, 2)
+    points2 = np.asarray(array2, dtype=np.float64).reshape(-1, 2)
+    closest_idx, closest_dist = _MATCHERS[method](points1, points2)
 
-    # Find closest points for each point in array1
-    results = []
-    for lat1, lon1 in array1:
-        # Query the KDTree for the closest neighbor
-        dist, idx = tree.query((math.radians(lat1), math.radians(lon1)))
+    return [
+        (tuple(point1), tuple(point2), distance_km)
+        for point1, point2, distance_km in zip(
+            points1.tolist(), points2[closest_idx].tolist(), np.asarray(closest_dist).tolist()
+        )
+    ]
 
-        # Convert the great-circle distance back to kilometers
-        lat2, lon2 = array2[idx]
-        distance_km = haversine(lat1, lon1, lat2, lon2)
+"""
+Stack parsed latitudes and longitudes into a single (N, 2) float64 array
+"""
+def _to_points(lats, lons):
+    return np.column_stack([np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)])
 
-        results.append(((lat1, lon1), (lat2, lon2), distance_km))
-    return results
+"""
+Parse a column of coordinate strings, falling back to parse_coordinate for non-decimal formats
+"""
+def _parse_coordinate_column(column):
+    values = pd.to_numeric(column, errors='coerce')
+    unparsed = values.isna() & column.notna()
+    if unparsed.any():
+        values[unparsed] = column[unparsed].map(_parse_coordinate_or_nan)
+    return values.to_numpy(dtype=np.float64)
+
+def _parse_coordinate_or_nan(coord_str):
+    try:
+        return parse_coordinate(coord_str)
+    except ValueError:
+        return np.nan
+
+"""
+Boolean mask of points whose latitude and longitude are in range, computed as one vectorized comparison
+(NaN from unparseable values compares False and is rejected as well)
+"""
+def _valid_coordinates_mask(lats, lons):
+    return (np.abs(lats) <= 90) & (np.abs(lons) <= 180)
 
 """
 Load coordinates from csv file
 """
 def load_coordinates_from_csv(file_path, lat_col, lon_col):
-    array = []
     try:
-        with open(file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row_num, row in enumerate(reader, start=1):
-                try:
-                    # Parse latitude and longitude using the universal parser
-                    lat = parse_coordinate(row[lat_col])
-                    lon = parse_coordinate(row[lon_col])
-                   
-                    # Validate latitude and longitude ranges
-                    if not (-90 <= lat <= 90):
-                        raise ValueError(f"Latitude out of range: {lat}")
-                    if not (-180 <= lon <= 180):
-                        raise ValueError(f"Longitude out of range: {lon}")
-                   
-                    array.append((lat, lon))
-                except ValueError as e:
-                    print(f"Invalid coordinate in row {row_num}. Skipping. Error: {e}")
+        # A callable usecols reads only the two columns without raising when one is missing,
+        # so missing columns can be reported separately from malformed files
+        df = pd.read_csv(file_path, usecols=lambda col: col in (lat_col, lon_col), dtype=str, encoding='utf-8')
     except FileNotFoundError:
         print(f"File {file_path} not found.")
-    except KeyError:
+        return _to_points([], [])
+    except pd.errors.EmptyDataError:
+        print(f"File {file_path} is empty.")
+        return _to_points([], [])
+    except pd.errors.ParserError as e:
+        print(f"File {file_path} could not be parsed as CSV: {e}")
+        return _to_points([], [])
+    except UnicodeDecodeError as e:
+        print(f"File {file_path} is not valid UTF-8: {e}")
+        return _to_points([], [])
+
+    if lat_col not in df.columns or lon_col not in df.columns:
         print(f"Specified columns '{lat_col}' or '{lon_col}' not found in the file.")
-    return array
+        return _to_points([], [])
+
+    # Parse latitude and longitude a column at a time, then validate ranges in one pass
+    lats = _parse_coordinate_column(df[lat_col])
+    lons = _parse_coordinate_column(df[lon_col])
+    mask = _valid_coordinates_mask(lats, lons)
+
+    skipped = np.flatnonzero(~mask)
+    for row_idx in skipped:
+        logging.info(f"Skipped row {row_idx + 1} in {file_path}: lat={df[lat_col].iat[row_idx]!r}, lon={df[lon_col].iat[row_idx]!r}")
+    if len(skipped):
+        print(f"Skipped {len(skipped)} invalid or out-of-range rows. See skipped_rows.log for details.")
+
+    return _to_points(lats[mask], lons[mask])
 
 """
 Convert DMS to decimal degrees
@@ -109,9 +522,15 @@ def parse_coordinate(coord_str):
     try:
         # Remove spaces for easier parsing
         coord_str = coord_str.strip()
+
+        # Most inputs are plain decimal degrees, so try that before any regex
+        try:
+            return float(coord_str)
+        except ValueError:
+            pass
        
         # Check for degrees, minutes, seconds (DMS) format
-        dms_match = re.match(r"(\d+)°\s*(\d+)'?\s*(\d+(?:\.\d+)?)?\"?\s*([NSEW])?", coord_str, re.IGNORECASE)
+        dms_match = _DMS_RE.match(coord_str)
         if dms_match:
             degrees = int(dms_match.group(1))
             minutes = int(dms_match.group(2))
@@ -125,7 +544,7 @@ def parse_coordinate(coord_str):
             return decimal
 
         # Check for decimal degrees with direction
-        dd_match = re.match(r"([+-]?\d+(?:\.\d+)?)°?\s*([NSEW])?", coord_str, re.IGNORECASE)
+        dd_match = _DD_RE.match(coord_str)
         if dd_match:
             decimal = float(dd_match.group(1))
             direction = dd_match.group(2).upper() if dd_match.group(2) else None
@@ -142,11 +561,15 @@ def parse_coordinate(coord_str):
     Prompt the user to input an array of GPS points (latitude and longitude).
     Input:
         None
+    When stdin is redirected from a file, the points are read in bulk without prompting.
     Output:
-        A list of tuples containing the entered (latitude, longitude) values.
+        An (N, 2) array containing the entered (latitude, longitude) values.
 """
 def user_input_array():
-    array = []
+    if not sys.stdin.isatty():
+        return _read_stdin_array()
+
+    lats, lons = [], []
     while True:
         try:
             lat_input = input("Enter latitude (e.g., '40.7128', '40°42'51\"N', or '40.7128° N'; type 'd' to finish): ")
@@ -164,39 +587,72 @@ def user_input_array():
                 print("Error: Longitude must be between -180 and 180. Please try again.")
                 continue
            
-            array.append((lat, lon))
+            lats.append(lat)
+            lons.append(lon)
         except ValueError as e:
             print(f"Invalid input: {e}")
-    return array
+    return _to_points(lats, lons)
+
+"""
+    Read alternating latitude and longitude lines from redirected stdin up to a 'd' line or end of input,
+    then parse and validate them as whole columns.
+"""
+def _read_stdin_array():
+    lines = []
+    for line in sys.stdin:
+        line = line.strip()
+        if line.lower() == 'd':
+            break
+        lines.append(line)
+
+    count = len(lines) // 2
+    if len(lines) % 2:
+        print(f"Skipping latitude '{lines[-1]}' with no matching longitude.")
+    if count == 0:
+        return _to_points([], [])
+
+    lats = _parse_coordinate_column(pd.Series(lines[0:2 * count:2], dtype=object))
+    lons = _parse_coordinate_column(pd.Series(lines[1:2 * count:2], dtype=object))
+    mask = _valid_coordinates_mask(lats, lons)
+
+    skipped = count - int(mask.sum())
+    if skipped:
+        print(f"Skipped {skipped} invalid or out-of-range points.")
+    return _to_points(lats[mask], lons[mask])
 
 """
     Get GPS points for an array based on user choice (manual or CSV).
 """
 def get_coordinates(array_name):
-    print(f"How would you like to input coordinates for {array_name}?")
-    choice = input("Type 'manual' for manual input or 'csv' for CSV file: ").strip().lower()
+    while True:
+        print(f"How would you like to input coordinates for {array_name}?")
+        choice = input("Type 'manual' (or 'm') for manual input or 'csv' (or 'c') for CSV file: ").strip().lower()
     
-    if choice == 'csv':
-        file_path = input(f"Enter the path to the CSV file for {array_name}: ")
-        lat_col = input(f"Enter the column name for latitude in {array_name}: ")
-        lon_col = input(f"Enter the column name for longitude in {array_name}: ")
-        return load_coordinates_from_csv(file_path, lat_col, lon_col)
-    elif choice == 'manual':
-        print(f"Input coordinates for {array_name}:")
-        return user_input_array()
-    else:
-        print("Invalid choice. Please type 'manual' or 'csv'.")
-        return get_coordinates(array_name)
+        if choice in ('csv', 'c'):
+            file_path = input(f"Enter the path to the CSV file for {array_name}: ")
+            lat_col = input(f"Enter the column name for latitude in {array_name}: ")
+            lon_col = input(f"Enter the column name for longitude in {array_name}: ")
+            return load_coordinates_from_csv(file_path, lat_col, lon_col)
+        elif choice in ('manual', 'm'):
+            print(f"Input coordinates for {array_name}:")
+            return user_input_array()
+        else:
+            print("Invalid choice. Please type 'manual' or 'csv'.")
 
 
-array1 = get_coordinates("Array 1")
-array2 = get_coordinates("Array 2")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Match each GPS point in array 1 to its closest point in array 2.")
+    parser.add_argument('--method', choices=sorted(_MATCHERS), default='balltree',
+                        help="Closest-point search to use (default: balltree)")
+    args = parser.parse_args()
 
-# Run calculations and output results
-if array1 and array2:
-    results = match_closest_points(array1, array2)
-    for point1, closest_point, distance in results:
-        print(f"Point {point1} is closest to {closest_point} with a distance of {distance:.2f} km")
-else:
-    print("One or both arrays are empty. Please check your input.")
+    array1 = get_coordinates("Array 1")
+    array2 = get_coordinates("Array 2")
 
+    # Run calculations and output results
+    if len(array1) and len(array2):
+        results = match_closest_points(array1, array2, method=args.method)
+        for point1, closest_point, distance in results:
+            print(f"Point {point1} is closest to {closest_point} with a distance of {distance:.2f} km")
+    else:
+        print("One or both arrays are empty. Please check your input.")
@@ -0,0 +1,74 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True, language_level=3
+"""
+    Compiled closest-point haversine kernel used by Geolocation_matcher's method='cython'.
+    Build in place with OpenMP (see setup.py):
+        python setup.py build_ext --inplace
+    The pairwise loop runs without the GIL; without the OpenMP flags the prange loop compiles to a serial loop.
+"""
+import numpy as np
+from cython.parallel import prange
+from libc.math cimport sin, cos, asin, sqrt, fmin, M_PI
+
+cdef double RADIUS_EARTH = 6371.0
+cdef double DEG_TO_RAD = M_PI / 180.0
+
+"""
+    Haversine term for two points given in radians, with the cosine of each latitude precomputed.
+"""
+cdef inline double _haversine_a(double lat1, double lon1, double cos_lat1,
+                                double lat2, double lon2, double cos_lat2) noexcept nogil:
+    cdef double sin_dlat = sin((lat1 - lat2) * 0.5)
+    cdef double sin_dlon = sin((lon1 - lon2) * 0.5)
+    return sin_dlat * sin_dlat + cos_lat1 * cos_lat2 * sin_dlon * sin_dlon
+
+"""
+    Find the closest point in array 2 for each point in array 1.
+    Inputs:
+        array1, array2: (N, 2) float64 arrays of (latitude, longitude) in degrees.
+    Outputs:
+        The index of the closest point in array2 and its distance in kilometers for each row of array1.
+"""
+def closest_points(const double[:, :] array1, const double[:, :] array2):
+    cdef Py_ssize_t n1 = array1.shape[0]
+    cdef Py_ssize_t n2 = array2.shape[0]
+    cdef Py_ssize_t i, j, best_j
+    cdef double lat1, lon1, cos_lat1, a, best_a
+
+    # Convert array 2 once into contiguous radians and cosines
+    lat2_arr = np.empty(n2, dtype=np.float64)
+    lon2_arr = np.empty(n2, dtype=np.float64)
+    cos_lat2_arr = np.empty(n2, dtype=np.float64)
+    cdef double[::1] lat2 = lat2_arr
+    cdef double[::1] lon2 = lon2_arr
+    cdef double[::1] cos_lat2 = cos_lat2_arr
+    for j in range(n2):
+        lat2[j] = array2[j, 0] * DEG_TO_RAD
+        lon2[j] = array2[j, 1] * DEG_TO_RAD
+        cos_lat2[j] = cos(lat2[j])
+
+    closest_idx = np.empty(n1, dtype=np.int64)
+    closest_dist = np.empty(n1, dtype=np.float64)
+    cdef long long[::1] out_idx = closest_idx
+    cdef double[::1] out_dist = closest_dist
+
+    for i in prange(n1, nogil=True, schedule='static'):
+        lat1 = array1[i, 0] * DEG_TO_RAD
+        lon1 = array1[i, 1] * DEG_TO_RAD
+        cos_lat1 = cos(lat1)
+        best_j = 0
+        best_a = 2.0
+        for j in range(n2):
+            if lat1 == lat2[j] and lon1 == lon2[j]:
+                a = 0.0
+            else:
+                a = _haversine_a(lat1, lon1, cos_lat1, lat2[j], lon2[j], cos_lat2[j])
+            # The distance grows monotonically with a, so only the best candidate in each row needs the asin
+            if a < best_a:
+                best_a = a
+                best_j = j
+            # Nothing can beat a zero distance, so stop scanning the row
+            if best_a == 0.0:
+                break
+        out_idx[i] = best_j
+        out_dist[i] = 2 * RADIUS_EARTH * asin(sqrt(fmin(best_a, 1.0)))
+    return closest_idx, closest_dist
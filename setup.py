@@ -0,0 +1,28 @@
+"""
+    Build the optional _haversine extension in place with OpenMP so its prange loop runs in parallel:
+        python setup.py build_ext --inplace
+"""
+import sys
+
+import numpy as np
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+# MSVC spells the OpenMP switch differently and links it implicitly
+if sys.platform == 'win32':
+    openmp_compile_args, openmp_link_args = ['/openmp'], []
+else:
+    openmp_compile_args, openmp_link_args = ['-O3', '-fopenmp'], ['-fopenmp']
+
+extension = Extension(
+    '_haversine',
+    sources=['_haversine.pyx'],
+    include_dirs=[np.get_include()],
+    extra_compile_args=openmp_compile_args,
+    extra_link_args=openmp_link_args,
+)
+
+setup(
+    name='geolocation-matcher-haversine',
+    ext_modules=cythonize([extension]),
+)